@@ -8,21 +8,60 @@ Created: 2025-01-03
 Version: 1.0.0
 """
 
+import argparse
 import os
+import posixpath
 import json
 import base64
+import codecs
 import hashlib
-import mimetypes
+import mmap
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+from urllib.parse import quote
 import re
+import logging
+import queue
+import sys
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from logging.handlers import QueueHandler, QueueListener
+
+from github_session import GitHubSession
+
+try:
+    from watchdog.observers import Observer
+except ImportError:  # optional: watch mode falls back to polling with os.scandir
+    Observer = None
+
+logger = logging.getLogger(__name__)
 
 # Configuration
 GITHUB_TOKEN = os.getenv('GITHUB_TOKEN', '')  # Set via environment variable or GitHub secrets
 GITHUB_API = 'https://api.github.com'
 GITHUB_USER = 'breverdbidder'
 OUTPUTS_DIR = Path('/mnt/user-data/outputs')
+HASH_CACHE_PATH = Path('/home/claude/.deployer_hash_cache.json')  # (mtime_ns, size) -> sha256
+DEPLOYED_INDEX_PATH = Path('/home/claude/.deployer_deployed.json')  # repo/path -> sha256, blob SHA
+PREPARE_WORKERS = 4  # Local read/hash/encode only (dry run)
+PUSH_WORKERS = 16  # Pushing is network-bound, so oversubscribe
+HASH_CHUNK_SIZE = 1 << 20  # 1 MiB reads let hashlib release the GIL per update()
+MMAP_THRESHOLD = 4 << 20  # Above 4 MiB, mmap beats read(); below, setup cost dominates
+ENCODE_CHUNK_SIZE = 3 << 18  # 768 KiB: a multiple of 3 so chunks Base64-encode independently
+WATCH_DEBOUNCE = 0.5  # seconds without new events before a watched batch deploys
+WATCH_POLL_INTERVAL = 2.0  # rescan interval when watchdog is not installed
+
+# Content is always sent as Base64 of the raw bytes; is_binary is manifest metadata
+_TEXT_EXTS = frozenset({
+    '.py', '.md', '.yml', '.yaml', '.json', '.html', '.css', '.js', '.txt'
+})
+_BINARY_EXTS = frozenset({
+    '.pdf', '.docx', '.xlsx', '.pptx', '.png', '.jpg', '.jpeg', '.gif', '.ico',
+    '.zip', '.tar', '.gz', '.woff', '.woff2'
+})
+PROBE_SIZE = 8192  # bytes inspected to classify files with other extensions
 
 # Deployment routing rules
 ROUTING_RULES = {
@@ -84,259 +123,817 @@ ROUTING_RULES = {
     }
 }
 
+# Rules of the form r'.*\.ext$' / r'.*\.(a|b)$' can be served by an extension lookup
+_SUFFIX_RULE = re.compile(r'^\.\*\\\.\(?([\w|]+)\)?\$$')
+_LITERAL_EXT = re.compile(r'\\\.(\w+)\$$')
+
+
+class RouteTarget(NamedTuple):
+    """Deployment target of a routing rule"""
+    repo: str
+    path: str
+    description: str
+
+
+_DEFAULT_ROUTE = RouteTarget('life-os', 'artifacts/', 'Unclassified artifact')
+
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    """Whether pattern contains a '|' outside any group or character class"""
+    depth = 0
+    in_class = False
+    escaped = False
+    for ch in pattern:
+        if escaped:
+            escaped = False
+        elif ch == '\\':
+            escaped = True
+        elif in_class:
+            in_class = ch != ']'
+        elif ch == '[':
+            in_class = True
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif ch == '|' and depth == 0:
+            return True
+    return False
+
+
+def _build_routing_tables(rules: Dict) -> Tuple[Dict[str, int], re.Pattern, List[RouteTarget]]:
+    """Precompile ROUTING_RULES into an extension table and one fused regex.
+    
+    An extension only goes into the lookup table when no earlier regex rule
+    could claim it, so first-match-wins ordering is preserved exactly.
+    """
+    by_ext = {}
+    regex_exts = set()
+    opaque = False  # an earlier regex rule may match any extension
+    
+    for index, pattern in enumerate(rules):
+        if _has_top_level_alternation(pattern):
+            # e.g. r'.*\.md$|.*\.txt$' can claim several extensions
+            opaque = True
+            continue
+        
+        suffix = _SUFFIX_RULE.match(pattern)
+        if suffix:
+            if not opaque:
+                for ext in suffix.group(1).split('|'):
+                    ext = '.' + ext.lower()
+                    if ext not in regex_exts:
+                        by_ext.setdefault(ext, index)
+            continue
+        
+        literal = _LITERAL_EXT.search(pattern)
+        if literal:
+            regex_exts.add('.' + literal.group(1).lower())
+        else:
+            opaque = True
+    
+    fused = re.compile(
+        '|'.join(f'(?P<r{i}>{pattern})' for i, pattern in enumerate(rules)),
+        re.IGNORECASE
+    )
+    return by_ext, fused, [RouteTarget(**target) for target in rules.values()]
+
+
+_EXT_ROUTES, _FUSED_RULES, _RULE_TABLE = _build_routing_tables(ROUTING_RULES)
+
+
+def _target_path(route: Dict, filepath: Path) -> str:
+    """Path of filepath inside its target repo"""
+    return route['path'] + filepath.name
+
+
+def _target_key(repo: str, path: str) -> str:
+    """Key of a deploy target in the deployed index and blob SHA table"""
+    return f"{repo}/{path}"
+
+
+def _is_binary_ext(filepath: Path) -> Optional[bool]:
+    """Classify a file by extension; None when the content has to decide"""
+    ext = filepath.suffix.lower()
+    if ext in _TEXT_EXTS:
+        return False
+    if ext in _BINARY_EXTS:
+        return True
+    return None
+
+
+def _looks_binary(head: bytes) -> bool:
+    """Classify a file from its first PROBE_SIZE bytes: NULs or invalid UTF-8"""
+    if b'\x00' in head:
+        return True
+    if head.isascii():
+        return False
+    try:
+        # Incremental so a multi-byte character cut off by the probe still passes
+        codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+    except UnicodeDecodeError:
+        return True
+    return False
+
+
+def _classify(filepath: Path) -> bool:
+    """Classify a file by extension, else by probing its first bytes"""
+    is_binary = _is_binary_ext(filepath)
+    if is_binary is None:
+        with open(filepath, 'rb') as f:
+            is_binary = _looks_binary(f.read(PROBE_SIZE))
+    return is_binary
+
+
+def _load_json(path: Optional[Path]) -> Dict:
+    """Load a JSON sidecar file; missing or corrupt files load as empty"""
+    if path is None:
+        return {}
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_json(path: Path, data: Dict):
+    """Write a JSON sidecar file; failures are logged, not raised"""
+    try:
+        path.write_text(json.dumps(data))
+    except OSError as e:
+        logger.warning(f"⚠️  Could not save {path}: {str(e)}")
+
+
+def _utc_timestamp() -> str:
+    """Current UTC time in ISO 8601 with a Z suffix"""
+    return datetime.utcnow().isoformat() + 'Z'
+
+
+class _ChangeHandler:
+    """watchdog event handler queueing paths of created, modified or moved files"""
+    
+    def __init__(self, enqueue):
+        self.enqueue = enqueue
+    
+    def dispatch(self, event):
+        if event.is_directory or event.event_type not in ('created', 'modified', 'moved'):
+            return
+        self.enqueue(getattr(event, 'dest_path', '') or event.src_path)
+
+
+class _PollingWatcher(threading.Thread):
+    """Fallback when watchdog is not installed: rescan with os.scandir"""
+    
+    def __init__(self, deployer: 'ClaudeAIDeployer', enqueue,
+                 interval: float = WATCH_POLL_INTERVAL):
+        super().__init__(daemon=True)
+        self.deployer = deployer
+        self.enqueue = enqueue
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._seen = {path: (st.st_mtime_ns, st.st_size)
+                      for path, st in deployer._stat_cache.items()}
+    
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                for entry in self.deployer._scandir_recursive(self.deployer.outputs_dir):
+                    st = entry.stat()
+                    signature = (st.st_mtime_ns, st.st_size)
+                    if self._seen.get(entry.path) != signature:
+                        self._seen[entry.path] = signature
+                        self.enqueue(entry.path)
+            except OSError as e:
+                logger.warning(f"⚠️  Rescan failed: {str(e)}")
+    
+    def stop(self):
+        self._stopped.set()
+
 
 class ClaudeAIDeployer:
     """Main deployment orchestrator"""
     
-    def __init__(self, outputs_dir: Path = OUTPUTS_DIR):
+    def __init__(self, outputs_dir: Path = OUTPUTS_DIR, dry_run: bool = False,
+                 hash_cache_path: Optional[Path] = HASH_CACHE_PATH,
+                 deployed_index_path: Optional[Path] = DEPLOYED_INDEX_PATH):
         self.outputs_dir = outputs_dir
         self.github_token = GITHUB_TOKEN
         self.github_api = GITHUB_API
         self.github_user = GITHUB_USER
+        self.dry_run = dry_run
+        self.session = GitHubSession(self.github_token, self.github_api,
+                                     pool_size=PUSH_WORKERS)
         self.deployment_log = []
+        self._log_lock = threading.Lock()
+        self._status_counts = Counter()  # kept in step with deployment_log
+        self._repo_locks: Dict[str, threading.Lock] = {}
+        self._stat_cache: Dict[str, os.stat_result] = {}
+        self._run_ts: Optional[str] = None  # one timestamp shared by a deploy_all run
+        self.hash_cache_path = hash_cache_path
+        self._hash_cache = _load_json(hash_cache_path)
+        self.deployed_index_path = deployed_index_path
+        self._deployed = {  # 'repo/path' -> {'sha256', 'blob_sha'} of the last push
+            key: entry if isinstance(entry, dict) else {'sha256': entry}  # older plain index
+            for key, entry in _load_json(deployed_index_path).items()
+        }
+        self._blob_shas: Dict[str, str] = {  # 'repo/path' -> GitHub blob SHA
+            key: entry['blob_sha'] for key, entry in self._deployed.items()
+            if entry.get('blob_sha')
+        }
         
+    def _scandir_recursive(self, path) -> Iterator[os.DirEntry]:
+        """Yield visible file entries below path (DirEntry caches type/stat)"""
+        try:
+            it = os.scandir(path)
+        except OSError as e:
+            # Like rglob, skip directories that cannot be listed
+            logger.warning(f"⚠️  Skipping unreadable directory {path}: {str(e)}")
+            return
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from self._scandir_recursive(entry.path)
+                elif not entry.name.startswith('.') and entry.is_file():
+                    yield entry
+    
     def scan_outputs(self) -> List[Path]:
         """Scan outputs directory for deployable files"""
         if not self.outputs_dir.exists():
-            print(f"⚠️  Outputs directory not found: {self.outputs_dir}")
+            logger.warning(f"⚠️  Outputs directory not found: {self.outputs_dir}")
             return []
         
         files = []
-        for item in self.outputs_dir.rglob('*'):
-            if item.is_file() and not item.name.startswith('.'):
-                files.append(item)
+        append = files.append
+        stat_cache = self._stat_cache
+        for entry in self._scandir_recursive(self.outputs_dir):
+            # Keep the stat so the manifest doesn't have to stat() again
+            path = entry.path
+            stat_cache[path] = entry.stat()
+            append(Path(path))
         
         return files
     
+    def _stat(self, filepath: Path) -> os.stat_result:
+        """Return stat for filepath, reusing the result cached by scan_outputs"""
+        st = self._stat_cache.get(str(filepath))
+        return st if st is not None else filepath.stat()
+    
     def route_file(self, filepath: Path) -> Optional[Dict]:
         """Determine deployment target for file"""
         filename = filepath.name
         
-        for pattern, target in ROUTING_RULES.items():
-            if re.match(pattern, filename, re.IGNORECASE):
-                return {
-                    'repo': target['repo'],
-                    'path': target['path'],
-                    'description': target['description'],
-                    'filename': filename
-                }
+        index = _EXT_ROUTES.get(os.path.splitext(filename)[1].lower())
+        if index is None:
+            match = _FUSED_RULES.match(filename)
+            if match:
+                index = int(match.lastgroup[1:])
         
-        # Default fallback
+        target = _RULE_TABLE[index] if index is not None else _DEFAULT_ROUTE
         return {
-            'repo': 'life-os',
-            'path': 'artifacts/',
-            'description': 'Unclassified artifact',
+            'repo': target.repo,
+            'path': target.path,
+            'description': target.description,
             'filename': filename
         }
     
-    def encode_file(self, filepath: Path) -> Tuple[str, bool]:
-        """Encode file content (Base64 for binary, UTF-8 for text)"""
-        try:
-            # Try to read as text first
-            content = filepath.read_text(encoding='utf-8')
-            return content, False  # Not binary
-        except UnicodeDecodeError:
-            # Binary file - use Base64
-            content = filepath.read_bytes()
-            encoded = base64.b64encode(content).decode('utf-8')
-            return encoded, True  # Is binary
+    def encode_file(self, filepath: Path) -> Tuple[bytes, bool]:
+        """Encode file content as Base64 (is_binary is a hint from the extension)"""
+        raw = filepath.read_bytes()
+        is_binary = _is_binary_ext(filepath)
+        if is_binary is None:
+            is_binary = _looks_binary(raw[:PROBE_SIZE])
+        return base64.b64encode(raw), is_binary
+    
+    def encode_and_hash(self, filepath: Path, checksum: Optional[str] = None
+                        ) -> Tuple[Union[bytes, bytearray], bool, str, int]:
+        """Encode file content and compute its SHA256 in a single read.
+        
+        Returns (content, is_binary, checksum, size_bytes). Content is Base64,
+        encoded chunk by chunk so the raw file is never held whole, and is
+        handed back in the buffer it was built in rather than copied.
+        A checksum that is already known (e.g. from the hash cache) is returned
+        as-is and the file is not hashed again.
+        """
+        is_binary = _is_binary_ext(filepath)
+        if self._stat(filepath).st_size > MMAP_THRESHOLD:
+            return self._encode_and_hash_mapped(filepath, is_binary, checksum)
+        
+        sha256 = hashlib.sha256() if checksum is None else None
+        data = bytearray()
+        pending = b''  # bytes left over from a short read, not yet 3-aligned
+        size = 0
+        view = memoryview(bytearray(ENCODE_CHUNK_SIZE))
+        with open(filepath, 'rb', buffering=0) as f:
+            while n := f.readinto(view):
+                chunk = view[:n]
+                if sha256:
+                    sha256.update(chunk)
+                if is_binary is None:
+                    is_binary = _looks_binary(bytes(chunk[:PROBE_SIZE]))
+                size += n
+                if pending:
+                    chunk = pending + chunk
+                cut = len(chunk) - len(chunk) % 3
+                data += base64.b64encode(chunk[:cut])
+                pending = bytes(chunk[cut:])
+        
+        if pending:
+            data += base64.b64encode(pending)
+        if sha256:
+            checksum = sha256.hexdigest()
+        
+        return data, bool(is_binary), checksum, size
+    
+    def _encode_and_hash_mapped(self, filepath: Path, is_binary: Optional[bool],
+                                checksum: Optional[str]
+                                ) -> Tuple[Union[bytes, bytearray], bool, str, int]:
+        """encode_and_hash for large files: hash and encode straight from the page cache"""
+        with open(filepath, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mm, 'madvise'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            if checksum is None:
+                checksum = hashlib.sha256(mm).hexdigest()
+            if is_binary is None:
+                is_binary = _looks_binary(mm[:PROBE_SIZE])
+            return base64.b64encode(mm), is_binary, checksum, len(mm)
+    
+    def _save_caches(self):
+        """Persist checksums for the files seen so far and the deployed index"""
+        if self.hash_cache_path is not None:
+            seen = {os.path.abspath(path) for path in self._stat_cache}
+            _save_json(self.hash_cache_path,
+                       {path: entry for path, entry in self._hash_cache.items()
+                        if path in seen})
+        if self.deployed_index_path is not None:
+            _save_json(self.deployed_index_path, self._deployed)
+    
+    def _cached_entry(self, filepath: Path) -> Optional[Dict]:
+        """Return the hash cache entry if the file is unchanged since it was hashed"""
+        entry = self._hash_cache.get(os.path.abspath(filepath))
+        if entry is None or 'is_binary' not in entry:
+            return None
+        st = self._stat(filepath)
+        if entry['mtime_ns'] != st.st_mtime_ns or entry['size'] != st.st_size:
+            return None
+        return entry
+    
+    def _remember_checksum(self, filepath: Path, checksum: str, is_binary: bool):
+        """Record checksum against the file's current mtime and size"""
+        st = self._stat(filepath)
+        self._hash_cache[os.path.abspath(filepath)] = {
+            'mtime_ns': st.st_mtime_ns,
+            'size': st.st_size,
+            'sha256': checksum,
+            'is_binary': is_binary
+        }
     
     def calculate_checksum(self, filepath: Path) -> str:
         """Calculate SHA256 checksum"""
+        if hasattr(hashlib, 'file_digest'):  # Python 3.11+: hashing loop runs in C
+            with open(filepath, 'rb') as f:
+                return hashlib.file_digest(f, 'sha256').hexdigest()
+        
         sha256 = hashlib.sha256()
-        with open(filepath, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b''):
-                sha256.update(chunk)
+        view = memoryview(bytearray(HASH_CHUNK_SIZE))
+        with open(filepath, 'rb', buffering=0) as f:
+            while n := f.readinto(view):
+                sha256.update(view[:n])
         return sha256.hexdigest()
     
     def create_deployment_manifest(self, filepath: Path, route: Dict, 
-                                   content: str, is_binary: bool) -> Dict:
+                                   content: Optional[Union[bytes, bytearray]], is_binary: bool,
+                                   checksum: Optional[str] = None,
+                                   size_bytes: Optional[int] = None) -> Dict:
         """Create deployment metadata"""
-        checksum = self.calculate_checksum(filepath)
+        if checksum is None:
+            checksum = self.calculate_checksum(filepath)
+        if size_bytes is None:
+            size_bytes = self._stat(filepath).st_size
         
         return {
             'source_file': str(filepath),
             'filename': filepath.name,
             'target_repo': route['repo'],
-            'target_path': route['path'] + filepath.name,
+            'target_path': _target_path(route, filepath),
             'description': route['description'],
             'is_binary': is_binary,
             'checksum': checksum,
-            'size_bytes': filepath.stat().st_size,
-            'created_at': datetime.utcnow().isoformat() + 'Z',
+            'size_bytes': size_bytes,
+            'created_at': self._run_ts or _utc_timestamp(),
             'deployed_by': 'claude-ai-deployer',
             'version': '1.0.0'
         }
     
-    def push_to_github(self, manifest: Dict, content: str) -> Dict:
-        """Push file to GitHub using REST API"""
+    def push_to_github(self, manifest: Dict,
+                       content: Optional[Union[bytes, bytearray]]) -> Dict:
+        """Push file to GitHub using REST API
+        
+        Content identical to the last successful push of the same target is
+        skipped. content may be None, in which case it is read only if needed.
+        """
         repo = manifest['target_repo']
         path = manifest['target_path']
+        key = _target_key(repo, path)
         
-        # For now, create the deployment script that will use curl
-        # (GitHub REST API via Python requires requests library)
+        deployed = self._deployed.get(key)
+        if deployed is not None and deployed['sha256'] == manifest['checksum']:
+            return {
+                'status': 'unchanged',
+                'repo': repo,
+                'path': path,
+                'manifest': manifest
+            }
         
-        deployment_cmd = self._generate_curl_command(manifest, content)
+        if content is None:
+            content = self.encode_and_hash(Path(manifest['source_file']),
+                                           manifest['checksum'])[0]
         
-        return {
-            'status': 'prepared',
+        if self.dry_run or not self.github_token:
+            # No credentials to push with: prepare a curl command instead
+            return {
+                'status': 'prepared',
+                'repo': repo,
+                'path': path,
+                'command': self._generate_curl_command(manifest, content),
+                'manifest': manifest
+            }
+        
+        api_path = self.session.contents_path(self.github_user, repo, path)
+        
+        # New files need no blob SHA, and the SHAs of files pushed before (also
+        # in earlier runs, via the deployed index) or listed are remembered
+        sha = self._blob_shas.get(key)
+        if sha is None and deployed is not None:
+            # Known to exist remotely: a PUT without SHA would fail after
+            # uploading the whole body, so look it up first
+            sha = self._lookup_blob_sha(repo, path)
+        status, body = self._put(repo, api_path, manifest, content, sha)
+        if status in (409, 422):
+            # Existing file with an unknown or stale SHA: list its directory, retry once
+            sha = self._lookup_blob_sha(repo, path)
+            if sha is not None:
+                status, body = self._put(repo, api_path, manifest, content, sha)
+        
+        result = {
+            'status': 'deployed' if status in (200, 201) else 'failed',
             'repo': repo,
             'path': path,
-            'command': deployment_cmd,
+            'http_status': status,
             'manifest': manifest
         }
+        if result['status'] == 'deployed':
+            blob_sha = json.loads(body)['content']['sha']
+            self._blob_shas[key] = blob_sha
+            self._deployed[key] = {'sha256': manifest['checksum'], 'blob_sha': blob_sha}
+        else:
+            result['error'] = body.decode('utf-8', 'replace')[:500]
+        return result
+    
+    def _put(self, repo: str, api_path: str, manifest: Dict, content: Union[bytes, bytearray],
+             sha: Optional[str]) -> Tuple[int, bytes]:
+        """PUT one file; returns (status, body)"""
+        # Concurrent commits to one branch conflict (409), so PUTs are per-repo serial
+        with self._repo_lock(repo):
+            status, headers, body = self.session.request(
+                'PUT', api_path, self._build_body(manifest, content, sha), pace=False)
+        # Rate-limit pacing must not hold up the other workers waiting on the lock
+        self.session.throttle(headers)
+        return status, body
+    
+    def _lookup_blob_sha(self, repo: str, path: str) -> Optional[str]:
+        """Find path's current blob SHA from a listing of its directory.
+        
+        Listings carry no file content, unlike a GET of the file itself, and
+        the SHAs of every sibling are cached for later pushes.
+        """
+        directory = posixpath.dirname(path)
+        api_path = self.session.contents_path(self.github_user, repo, directory).rstrip('/')
+        status, _, body = self.session.request('GET', api_path + '?ref=main')
+        if status != 200:
+            return None
+        
+        for entry in json.loads(body):
+            if entry.get('type') == 'file':
+                key = _target_key(repo, posixpath.join(directory, entry['name']))
+                self._blob_shas[key] = entry['sha']
+        return self._blob_shas.get(_target_key(repo, path))
+    
+    def _repo_lock(self, repo: str) -> threading.Lock:
+        """Return the lock serializing commits to repo"""
+        return self._repo_locks.setdefault(repo, threading.Lock())  # atomic on dict
+    
+    def _build_body(self, manifest: Dict, content: Union[bytes, bytearray],
+                    sha: Optional[str] = None) -> List[bytes]:
+        """Build the Contents API request body as JSON byte chunks.
+        
+        The Base64 content is spliced in as-is (it is ASCII and needs no JSON
+        escaping), so the largest part of the body is never copied.
+        """
+        meta = {
+            'message': f"Deploy: {manifest['filename']} - {manifest['description']}",
+            'branch': 'main'
+        }
+        if sha:
+            meta['sha'] = sha
+        head = json.dumps(meta, separators=(',', ':'))[:-1]  # drop closing brace
+        return [head.encode('ascii') + b',"content":"', content, b'"}']
     
-    def _generate_curl_command(self, manifest: Dict, content: str) -> str:
+    def _generate_curl_command(self, manifest: Dict, content: Union[bytes, bytearray]) -> str:
         """Generate curl command for GitHub deployment"""
         repo = manifest['target_repo']
         path = manifest['target_path']
-        message = f"Deploy: {manifest['filename']} - {manifest['description']}"
+        url = f"{self.github_api}/repos/{self.github_user}/{repo}/contents/{quote(path)}"
         
-        # Escape content for JSON
-        content_escaped = content.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        # Single-line JSON fed through a quoted heredoc: no shell quoting or escaping
+        body = b''.join(self._build_body(manifest, content)).decode('ascii')
         
         cmd = f'''curl -X PUT \\
   -H "Authorization: token {self.github_token}" \\
   -H "Accept: application/vnd.github.v3+json" \\
-  "{self.github_api}/repos/{self.github_user}/{repo}/contents/{path}" \\
-  -d '{{"message": "{message}", "content": "{base64.b64encode(content.encode()).decode()}", "branch": "main"}}'
+  "{url}" \\
+  --data-binary @- <<'JSON'
+{body}
+JSON
 '''
         
         return cmd
     
     def deploy_file(self, filepath: Path) -> Dict:
         """Complete deployment pipeline for single file"""
-        print(f"\n📦 Processing: {filepath.name}")
-        
         # Route file
         route = self.route_file(filepath)
-        print(f"   → Target: {route['repo']}/{route['path']}")
         
-        # Encode content
-        content, is_binary = self.encode_file(filepath)
-        print(f"   → Encoded: {'Binary (Base64)' if is_binary else 'Text (UTF-8)'}")
+        # Encode content and checksum in one pass; a file unchanged since it was
+        # last hashed is not read here at all, only if it actually needs pushing
+        cached = self._cached_entry(filepath)
+        if cached is not None:
+            content = None
+            is_binary, checksum, size_bytes = (
+                cached['is_binary'], cached['sha256'], cached['size'])
+        elif _target_key(route['repo'], _target_path(route, filepath)) in self._deployed:
+            # Touched since the last push: hash first, as the content is often the
+            # same; push_to_github encodes it only if the checksum differs. An
+            # edited file is then read twice (hash, then encode) instead of once;
+            # accepted so that files merely touched are never Base64-encoded.
+            content = None
+            checksum = self.calculate_checksum(filepath)
+            is_binary = _classify(filepath)
+            size_bytes = self._stat(filepath).st_size
+            self._remember_checksum(filepath, checksum, is_binary)
+        else:
+            content, is_binary, checksum, size_bytes = self.encode_and_hash(filepath)
+            self._remember_checksum(filepath, checksum, is_binary)
         
         # Create manifest
-        manifest = self.create_deployment_manifest(filepath, route, content, is_binary)
-        print(f"   → Checksum: {manifest['checksum'][:8]}...")
+        manifest = self.create_deployment_manifest(filepath, route, content, is_binary,
+                                                   checksum, size_bytes)
         
         # Push to GitHub
         result = self.push_to_github(manifest, content)
-        print(f"   → Status: {result['status'].upper()}")
         
-        self.deployment_log.append({
-            'filepath': str(filepath),
-            'manifest': manifest,
-            'result': result,
-            'timestamp': datetime.utcnow().isoformat() + 'Z'
-        })
+        # One record per file keeps each file's lines together under threads
+        logger.info(
+            f"\n📦 Processing: {filepath.name}\n"
+            f"   → Target: {route['repo']}/{route['path']}\n"
+            f"   → Encoded: {'Binary' if is_binary else 'Text'} (Base64)\n"
+            f"   → Checksum: {manifest['checksum'][:8]}...\n"
+            f"   → Status: {result['status'].upper()}"
+        )
+        
+        with self._log_lock:
+            self.deployment_log.append({
+                'filepath': str(filepath),
+                'manifest': manifest,
+                'result': result,
+                'timestamp': self._run_ts or _utc_timestamp()
+            })
+            self._status_counts[result['status']] += 1
         
         return result
     
-    def deploy_all(self) -> List[Dict]:
-        """Deploy all files in outputs directory"""
+    def deploy_all(self, max_workers: Optional[int] = None,
+                   watch: bool = False) -> List[Dict]:
+        """Deploy all files in outputs directory
+        
+        With watch=True, keep running after the initial pass and deploy files
+        as they are created or modified, until interrupted with Ctrl-C.
+        """
+        self._run_ts = _utc_timestamp()
         files = self.scan_outputs()
         
         if not files:
-            print("✅ No files to deploy")
-            return []
+            logger.info("✅ No files to deploy")
+            if not watch or not self.outputs_dir.exists():
+                return []
+        else:
+            logger.info(f"\n🚀 Claude AI Auto-Deploy System v1.0.0")
+            logger.info(f"📁 Found {len(files)} file(s) to deploy\n")
         
-        print(f"\n🚀 Claude AI Auto-Deploy System v1.0.0")
-        print(f"📁 Found {len(files)} file(s) to deploy\n")
+        # Hashing releases the GIL and pushing is network-bound, so files overlap
+        if max_workers is None:
+            pushing = self.github_token and not self.dry_run
+            max_workers = PUSH_WORKERS if pushing else PREPARE_WORKERS
+        workers = max_workers if watch else min(max_workers, len(files))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = self._deploy_batch(files, executor) if files else []
+            if watch:
+                results += self._watch(executor)
         
-        results = []
-        for filepath in files:
+        return results
+    
+    def _deploy_batch(self, files: List[Path], executor: ThreadPoolExecutor) -> List[Dict]:
+        """Deploy files on executor; results and log entries keep the order given"""
+        first_entry = len(self.deployment_log)
+        results = [None] * len(files)
+        futures = {executor.submit(self.deploy_file, filepath): index
+                   for index, filepath in enumerate(files)}
+        for future in as_completed(futures):
+            index = futures[future]
             try:
-                result = self.deploy_file(filepath)
-                results.append(result)
+                results[index] = future.result()
             except Exception as e:
-                print(f"❌ Failed to deploy {filepath.name}: {str(e)}")
-                results.append({
+                filepath = files[index]
+                logger.error(f"❌ Failed to deploy {filepath.name}: {str(e)}")
+                results[index] = {
                     'status': 'failed',
                     'error': str(e),
                     'filepath': str(filepath)
-                })
+                }
+        
+        # deploy_file appends in completion order; restore scan order for the report
+        order = {str(filepath): index for index, filepath in enumerate(files)}
+        with self._log_lock:
+            self.deployment_log[first_entry:] = sorted(
+                self.deployment_log[first_entry:], key=lambda log: order[log['filepath']])
+        
+        self._save_caches()
+        return results
+    
+    def _watch(self, executor: ThreadPoolExecutor) -> List[Dict]:
+        """Deploy changed files as they appear until interrupted"""
+        changed = queue.SimpleQueue()
+        if Observer is not None:
+            watcher = Observer()
+            watcher.schedule(_ChangeHandler(changed.put), str(self.outputs_dir),
+                             recursive=True)
+        else:
+            watcher = _PollingWatcher(self, changed.put)
+        watcher.start()
+        logger.info(f"👀 Watching {self.outputs_dir} for changes (Ctrl-C to stop)")
+        
+        results = []
+        pending = set()
+        try:
+            while True:
+                try:
+                    pending.add(changed.get(timeout=WATCH_DEBOUNCE))
+                    continue
+                except queue.Empty:
+                    if not pending:
+                        continue
+                
+                # Quiet for WATCH_DEBOUNCE: deploy everything that changed
+                files = []
+                for path in pending:
+                    filepath = Path(path)
+                    if filepath.name.startswith('.') or not filepath.is_file():
+                        continue
+                    self._stat_cache[path] = filepath.stat()
+                    files.append(filepath)
+                pending.clear()
+                
+                if files:
+                    self._run_ts = _utc_timestamp()
+                    results += self._deploy_batch(files, executor)
+        except KeyboardInterrupt:
+            logger.info("\n🛑 Stopped watching")
+        finally:
+            watcher.stop()
+            watcher.join()
         
         return results
     
     def generate_deployment_report(self) -> str:
         """Generate deployment summary report"""
         total = len(self.deployment_log)
-        prepared = sum(1 for log in self.deployment_log 
-                      if log['result']['status'] == 'prepared')
-        failed = sum(1 for log in self.deployment_log 
-                    if log['result']['status'] == 'failed')
+        counts = self._status_counts
         
-        report = f"""
+        parts = [f"""
 ╔══════════════════════════════════════════════════════════════╗
 ║            CLAUDE AI AUTO-DEPLOY REPORT                      ║
 ╚══════════════════════════════════════════════════════════════╝
 
-Timestamp: {datetime.utcnow().isoformat()}Z
+Timestamp: {_utc_timestamp()}
 Total Files: {total}
-Prepared: {prepared}
-Failed: {failed}
+Deployed: {counts['deployed']}
+Unchanged: {counts['unchanged']}
+Prepared: {counts['prepared']}
+Failed: {counts['failed']}
 
 Deployments:
-"""
+"""]
         
         for log in self.deployment_log:
             manifest = log['manifest']
             result = log['result']
-            status_icon = "✅" if result['status'] == 'prepared' else "❌"
+            status_icon = "✅" if result['status'] in ('deployed', 'unchanged', 'prepared') else "❌"
             
-            report += f"""
+            parts.append(f"""
 {status_icon} {manifest['filename']}
    Repo: {manifest['target_repo']}
    Path: {manifest['target_path']}
    Size: {manifest['size_bytes']:,} bytes
    Checksum: {manifest['checksum'][:16]}...
-"""
+""")
         
-        return report
+        return ''.join(parts)
     
     def save_deployment_log(self, output_path: Path):
         """Save deployment log to JSON file"""
         log_data = {
             'version': '1.0.0',
-            'timestamp': datetime.utcnow().isoformat() + 'Z',
+            'timestamp': _utc_timestamp(),
             'total_deployments': len(self.deployment_log),
             'deployments': self.deployment_log
         }
         
         output_path.write_text(json.dumps(log_data, indent=2))
-        print(f"\n💾 Deployment log saved: {output_path}")
+        logger.info(f"\n💾 Deployment log saved: {output_path}")
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """Main execution"""
-    deployer = ClaudeAIDeployer()
+    parser = argparse.ArgumentParser(description='Deploy Claude AI artifacts to GitHub')
+    parser.add_argument('--emit-script', action='store_true',
+                        help='dry run: write curl commands to deploy_commands.sh '
+                             'instead of pushing')
+    parser.add_argument('--watch', action='store_true',
+                        help='keep deploying files as they change until Ctrl-C')
+    args = parser.parse_args(argv)
+    
+    propagate = logger.propagate
+    listener, handler = _start_log_listener()
+    try:
+        return _run(emit_script=args.emit_script, watch=args.watch)
+    finally:
+        listener.stop()
+        logger.removeHandler(handler)
+        logger.propagate = propagate
+
+
+def _start_log_listener() -> Tuple[QueueListener, QueueHandler]:
+    """Drain log records to stdout from one background thread.
+    
+    Worker threads only enqueue records, so they never contend on stdout.
+    Returns the listener and the handler installed on the logger; the caller
+    stops the one and removes the other when done.
+    """
+    log_queue = queue.SimpleQueue()
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(logging.Formatter('%(message)s'))
+    handler = QueueHandler(log_queue)
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    # Records go to stdout once, not also through any root handlers
+    logger.propagate = False
+    listener = QueueListener(log_queue, stream)
+    listener.start()
+    return listener, handler
+
+
+def _run(emit_script: bool = False, watch: bool = False) -> List[Dict]:
+    deployer = ClaudeAIDeployer(dry_run=emit_script)
     
     # Deploy all files
-    results = deployer.deploy_all()
+    results = deployer.deploy_all(watch=watch)
     
     # Generate report
     report = deployer.generate_deployment_report()
-    print(report)
+    logger.info(report)
     
     # Save log
     log_path = Path('/home/claude/deployment_log.json')
     deployer.save_deployment_log(log_path)
     
-    # Save deployment commands script
-    commands_path = Path('/home/claude/deploy_commands.sh')
-    with open(commands_path, 'w') as f:
-        f.write("#!/bin/bash\n\n")
-        f.write("# Claude AI Auto-Deploy Commands\n")
-        f.write(f"# Generated: {datetime.utcnow().isoformat()}Z\n\n")
+    # Save deployment commands script, built in memory and written once.
+    # Files are prepared rather than pushed on --emit-script and whenever no
+    # GITHUB_TOKEN is set, so write it whenever there is anything to run.
+    commands = [log['result']['command'] for log in deployer.deployment_log
+                if log['result']['status'] == 'prepared']
+    if commands:
+        parts = [
+            "#!/bin/bash\n\n",
+            "# Claude AI Auto-Deploy Commands\n",
+            f"# Generated: {_utc_timestamp()}\n\n"
+        ]
+        for command in commands:
+            parts.append(command)
+            parts.append("\n\n")
         
-        for log in deployer.deployment_log:
-            if log['result']['status'] == 'prepared':
-                f.write(log['result']['command'])
-                f.write("\n\n")
-    
-    commands_path.chmod(0o755)
-    print(f"📜 Deployment commands saved: {commands_path}")
+        commands_path = Path('/home/claude/deploy_commands.sh')
+        commands_path.write_text(''.join(parts))
+        commands_path.chmod(0o755)
+        logger.info(f"📜 Deployment commands saved: {commands_path}")
     
     return results
 
@@ -9,22 +9,28 @@ Created: 2025-01-03
 
 import json
 import sys
-import time
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List
-import subprocess
+from typing import Dict, List, Optional
+
+from github_session import GitHubSession
+
+VERIFY_WORKERS = 8
 
 
 class DeploymentVerifier:
     """Verifies GitHub deployments"""
     
-    def __init__(self, log_path: Path):
+    def __init__(self, log_path: Path, session: Optional[GitHubSession] = None):
         self.log_path = log_path
         self.log_data = self._load_log()
         self.github_token = os.getenv('GITHUB_TOKEN', '')  # Set via environment variable
         self.github_api = 'https://api.github.com'
         self.github_user = 'breverdbidder'
+        # Reuse the deployer's session when given one: its connections are already open
+        self.session = session or GitHubSession(self.github_token, self.github_api,
+                                                pool_size=VERIFY_WORKERS)
     
     def _load_log(self) -> Dict:
         """Load deployment log"""
@@ -35,20 +41,13 @@ class DeploymentVerifier:
         return json.loads(self.log_path.read_text())
     
     def verify_file_exists(self, repo: str, path: str) -> bool:
-        """Verify file exists in GitHub repo using curl"""
-        url = f"{self.github_api}/repos/{self.github_user}/{repo}/contents/{path}"
-        
-        cmd = [
-            'curl', '-s', '-o', '/dev/null', '-w', '%{http_code}',
-            '-H', f'Authorization: token {self.github_token}',
-            '-H', 'Accept: application/vnd.github.v3+json',
-            url
-        ]
+        """Verify file exists in GitHub repo"""
+        api_path = self.session.contents_path(self.github_user, repo, path)
         
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-            status_code = result.stdout.strip()
-            return status_code == '200'
+            # HEAD answers with the same status without downloading the content
+            status, _, _ = self.session.request('HEAD', api_path)
+            return status == 200
         except Exception as e:
             print(f"⚠️  Verification error: {str(e)}")
             return False
@@ -64,35 +63,33 @@ class DeploymentVerifier:
         failed = 0
         
         results = []
-        
         for deployment in deployments:
             manifest = deployment.get('manifest', {})
-            filename = manifest.get('filename', 'unknown')
-            repo = manifest.get('target_repo', '')
-            path = manifest.get('target_path', '')
-            
-            print(f"\n📄 {filename}")
-            print(f"   Repo: {repo}")
-            print(f"   Path: {path}")
-            
-            # Wait 2 seconds between checks (rate limiting)
-            time.sleep(2)
-            
-            exists = self.verify_file_exists(repo, path)
+            results.append({
+                'filename': manifest.get('filename', 'unknown'),
+                'repo': manifest.get('target_repo', ''),
+                'path': manifest.get('target_path', ''),
+                'verified': False
+            })
+        
+        # Checks are independent; the session backs off if GitHub rate-limits us
+        with ThreadPoolExecutor(max_workers=VERIFY_WORKERS) as executor:
+            futures = {executor.submit(self.verify_file_exists, r['repo'], r['path']): r
+                       for r in results}
+            for future in as_completed(futures):
+                futures[future]['verified'] = future.result()
+        
+        for result in results:
+            print(f"\n📄 {result['filename']}")
+            print(f"   Repo: {result['repo']}")
+            print(f"   Path: {result['path']}")
             
-            if exists:
+            if result['verified']:
                 print(f"   Status: ✅ VERIFIED")
                 verified += 1
             else:
                 print(f"   Status: ❌ NOT FOUND")
                 failed += 1
-            
-            results.append({
-                'filename': filename,
-                'repo': repo,
-                'path': path,
-                'verified': exists
-            })
         
         print("\n" + "=" * 60)
         print(f"\n📊 Verification Summary")
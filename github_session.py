@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+GitHub REST API Session
+Keep-alive HTTPS connections shared by the deployer and the verifier
+
+Author: Ariel Shapira / BidDeed.AI
+"""
+
+import http.client
+import json
+import queue
+import time
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import quote, urlsplit
+
+USER_AGENT = 'claude-ai-deployer'
+MAX_RETRIES = 3
+RATE_LIMIT_FLOOR = 10  # start pacing requests below this many remaining
+MAX_BACKOFF = 60  # seconds; longer waits are left to the next scheduled run
+
+# A pooled connection the server already closed fails on first reuse
+_STALE_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+
+class GitHubSession:
+    """Pool of persistent HTTPS connections to the GitHub API.
+
+    Each request borrows a connection, so one session can be shared across
+    threads while paying the TCP + TLS handshake once per pooled connection.
+    """
+
+    def __init__(self, token: str, api_url: str = 'https://api.github.com',
+                 pool_size: int = 8, timeout: float = 10):
+        parts = urlsplit(api_url)
+        self.host = parts.netloc
+        self.base_path = parts.path.rstrip('/')
+        self.timeout = timeout
+        self.headers = {
+            'Accept': 'application/vnd.github.v3+json',
+            'User-Agent': USER_AGENT
+        }
+        if token:
+            self.headers['Authorization'] = f'token {token}'
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+
+    def contents_path(self, user: str, repo: str, path: str) -> str:
+        """Build the request path for the Contents API"""
+        return f"{self.base_path}/repos/{user}/{repo}/contents/{quote(path)}"
+
+    def request(self, method: str, path: str,
+                body: Union[Dict, List[bytes], None] = None, pace: bool = True
+                ) -> Tuple[int, http.client.HTTPMessage, bytes]:
+        """Send a request, backing off only when GitHub asks us to.
+
+        body is either a dict to serialize or a list of pre-encoded JSON byte
+        chunks, which are written to the socket one after another without
+        being joined. With pace=False the caller is responsible for calling
+        throttle() with the response headers (e.g. after releasing a lock).
+        Returns (status, headers, body).
+        """
+        headers = dict(self.headers)
+        payload = None
+        if isinstance(body, dict):
+            payload = json.dumps(body, separators=(',', ':')).encode('utf-8')
+        elif body is not None:
+            payload = body
+            headers['Content-Length'] = str(sum(len(chunk) for chunk in body))
+        if payload is not None:
+            headers['Content-Type'] = 'application/json'
+
+        for attempt in range(MAX_RETRIES + 1):
+            status, resp_headers, data = self._send(method, path, payload, headers)
+            delay = self._backoff_delay(status, resp_headers)
+            if delay is None or attempt == MAX_RETRIES:
+                break
+            time.sleep(delay)
+
+        if pace:
+            self.throttle(resp_headers)
+
+        return status, resp_headers, data
+
+    def throttle(self, headers: http.client.HTTPMessage):
+        """Pause before the next request if the rate budget is running low"""
+        delay = self._throttle_delay(headers)
+        if delay:
+            time.sleep(delay)
+
+    def close(self):
+        """Close all pooled connections"""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def _send(self, method: str, path: str, payload: Union[bytes, List[bytes], None],
+              headers: Dict) -> Tuple[int, http.client.HTTPMessage, bytes]:
+        conn = self._acquire()
+        try:
+            try:
+                conn.request(method, path, body=payload, headers=headers)
+                resp = conn.getresponse()
+            except _STALE_ERRORS:
+                conn.close()
+                conn.request(method, path, body=payload, headers=headers)
+                resp = conn.getresponse()
+            # Drain the body so the connection can be reused
+            data = resp.read()
+        except Exception:
+            conn.close()
+            raise
+
+        if resp.will_close:
+            conn.close()
+        else:
+            self._release(conn)
+        return resp.status, resp.headers, data
+
+    def _acquire(self) -> http.client.HTTPSConnection:
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return http.client.HTTPSConnection(self.host, timeout=self.timeout)
+
+    def _release(self, conn: http.client.HTTPSConnection):
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    @staticmethod
+    def _throttle_delay(headers: http.client.HTTPMessage) -> float:
+        """Seconds to pace the next request when the rate budget runs low"""
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+        if remaining is None or reset is None or int(remaining) >= RATE_LIMIT_FLOOR:
+            return 0
+        # Spread what is left of the budget over the rest of the window
+        wait = (int(reset) - time.time()) / (int(remaining) + 1)
+        return min(max(wait, 0), MAX_BACKOFF)
+
+    @staticmethod
+    def _backoff_delay(status: int, headers: http.client.HTTPMessage) -> Optional[float]:
+        """Seconds to wait before retrying, or None if no retry is needed"""
+        if status not in (403, 429):
+            return None
+
+        retry_after = headers.get('Retry-After')
+        if retry_after is not None:
+            return min(float(retry_after), MAX_BACKOFF)
+
+        if headers.get('X-RateLimit-Remaining') == '0':
+            reset = headers.get('X-RateLimit-Reset')
+            wait = int(reset) - time.time() + 1 if reset else MAX_BACKOFF
+            return min(max(wait, 0), MAX_BACKOFF)
+
+        return None